@@ -0,0 +1,6 @@
+# conftest.py
+# Makes the src package importable from the tests and provides a valid encryption key for them
+
+import os
+
+os.environ.setdefault("TESLA_FLEET_ENCRYPTION_KEY", "ZmDfcTF7_60GrrY167zsiPd67pEvs0aGOv2oasOM1Pg=")
@@ -1,7 +1,15 @@
 # config.py
 # Configuration settings for the Distributed Inference System across Tesla Fleet
 
-class Config:
+import json
+import os
+from functools import lru_cache
+from types import MappingProxyType
+
+CONFIG_FILE_ENV_VAR = "TESLA_FLEET_CONFIG"  # Path to a JSON file overriding the defaults below
+CONFIG_ENV_PREFIX = "TESLA_FLEET_"  # e.g. TESLA_FLEET_LOGGING_LEVEL=DEBUG overrides LOGGING_LEVEL
+
+class DefaultConfig:
     # General settings
     SYSTEM_NAME = "Tesla Fleet Distributed Inference System"
     DEBUG_MODE = False
@@ -27,6 +35,30 @@ class Config:
     # Scheduler settings
     TASK_ALLOCATION_STRATEGY = "dynamic"  # Options: 'static', 'dynamic'
     LOAD_BALANCING_ALGORITHM = "predictive"  # Options: 'round-robin', 'predictive'
+    TASK_PRIORITY_CLASSES = {"critical": 0, "high": 1, "normal": 2, "batch": 3}  # Lower rank is served first
+    DEFAULT_TASK_PRIORITY = "normal"
+    TASK_DEADLINE_SECONDS = {"critical": 0.5, "high": 2, "normal": 30, "batch": 600}  # Default deadline per class
+    NODE_LOAD_CAPACITY = 100  # Load a node accepts unless it reports its own 'capacity'
+    ADMISSION_CONTROL_ENABLED = True
+    MAX_READY_QUEUE_SIZE = 1000  # Deferred tasks held while the fleet is saturated
+    ADMISSION_BACKLOG_FACTOR = 2.0  # Queued load allowed, as a multiple of fleet capacity
+    PREEMPTION_ENABLED = True  # Evict queued lower-priority tasks to admit higher-priority ones
+
+    # Inference settings
+    MODEL_PATH = "/opt/tesla_fleet/models/model.h5"
+    FLOAT16_MODEL_PATH = "/opt/tesla_fleet/models/model_fp16.tflite"  # Used when INFERENCE_PRECISION is 'float16'
+    QUANTIZED_MODEL_PATH = "/opt/tesla_fleet/models/model_int8.tflite"  # Used when INFERENCE_PRECISION is 'int8'
+    INFERENCE_PRECISION = "float32"  # Options: 'float32', 'float16', 'int8'
+    RESULT_ENCODING = "full"  # Options: 'full', 'float16', 'top_k'
+    RESULT_TOP_K = 5  # Number of classes kept per sample when RESULT_ENCODING is 'top_k'
+
+    # Edge aggregation settings (V2I roadside units)
+    EDGE_AGGREGATOR_ID = "edge-0"
+    EDGE_AGGREGATOR_REGION = "default"
+    EDGE_LISTEN_PORT = 5001  # Port on which nearby vehicles deliver their results
+    PARTIAL_AGGREGATE_PORT = 5002  # Port on which the central server accepts partial aggregates from edge nodes
+    EDGE_FLUSH_INTERVAL_SECONDS = 5  # Forward a partial aggregate upstream at least this often
+    EDGE_FLUSH_MAX_RESULTS = 500  # Forward early once this many vehicle results are pending
 
     # Data management
     DATA_PREPROCESSING_REQUIRED = True
@@ -42,6 +74,92 @@ class Config:
     UPDATE_CHECK_URL = "https://update.server.com/check"
     UPDATE_FREQUENCY_HOURS = 24  # Check for updates every 24 hours
 
+    # Vehicle node settings
+    CHECK_INTERVAL = 5  # Seconds between checks for new instructions
+
+    # Startup settings
+    STARTUP_PROFILE_ENABLED = False  # Log import and initialization time of each module at startup
+
     # Define any additional configuration parameters that might be needed for the project
 
+class FrozenConfig:
+    """
+    Immutable, attribute-style view of the loaded configuration values.
+    """
+    __slots__ = ("_values",)
+
+    def __init__(self, values):
+        frozen = {key: MappingProxyType(value) if isinstance(value, dict) else value for key, value in values.items()}
+        object.__setattr__(self, "_values", MappingProxyType(frozen))
+
+    def __getattr__(self, name):
+        if name == "_values":
+            # Not yet initialized, e.g. while copy or pickle rebuild the object
+            raise AttributeError(name)
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(f"Unknown configuration setting: {name}") from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Configuration is immutable once loaded")
+
+    def __reduce__(self):
+        return (FrozenConfig, (self.as_dict(),))
+
+    def as_dict(self):
+        return {key: dict(value) if isinstance(value, MappingProxyType) else value
+                for key, value in self._values.items()}
+
+_TRUE_STRINGS = ("1", "true", "yes", "on")
+_FALSE_STRINGS = ("0", "false", "no", "off")
+
+def _parse_env_value(key, value, default):
+    """
+    Converts an environment override to the type of the setting's default value.
+    Booleans accept true/false, yes/no, on/off and 1/0; dicts are parsed as JSON; strings are kept as is.
+    """
+    if isinstance(default, bool):
+        lowered = value.strip().lower()
+        if lowered in _TRUE_STRINGS:
+            return True
+        if lowered in _FALSE_STRINGS:
+            return False
+        raise ValueError(f"Invalid boolean for {CONFIG_ENV_PREFIX}{key}: {value!r}")
+    if isinstance(default, (int, float)):
+        try:
+            return type(default)(value)
+        except ValueError:
+            raise ValueError(f"Invalid {type(default).__name__} for {CONFIG_ENV_PREFIX}{key}: {value!r}") from None
+    if isinstance(default, dict):
+        return json.loads(value)
+    return value
+
+@lru_cache(maxsize=None)
+def load_config(config_path=None):
+    """
+    Loads the configuration once: defaults, then the JSON config file, then environment overrides.
+    :param config_path: Path to a JSON config file; defaults to the TESLA_FLEET_CONFIG environment variable.
+    :return: Cached FrozenConfig instance.
+    """
+    values = {key: value for key, value in vars(DefaultConfig).items() if key.isupper()}
+
+    config_path = config_path or os.environ.get(CONFIG_FILE_ENV_VAR)
+    if config_path:
+        with open(config_path, 'r') as file:
+            file_values = json.load(file)
+        unknown = sorted(set(file_values) - set(values))
+        if unknown:
+            raise ValueError(f"Unknown configuration settings in {config_path}: {', '.join(unknown)}")
+        values.update(file_values)
+
+    for key, default in vars(DefaultConfig).items():
+        env_value = os.environ.get(CONFIG_ENV_PREFIX + key) if key.isupper() else None
+        if env_value is not None:
+            values[key] = _parse_env_value(key, env_value, default)
+
+    return FrozenConfig(values)
+
+Config = load_config()
+
 # End of config.py
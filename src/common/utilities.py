@@ -3,13 +3,24 @@
 
 import logging
 import json
+import struct
+import time
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
 from .config import Config
 
+_logging_configured = False
+_startup_profile = []  # (label, seconds) pairs recorded while the startup profile is enabled
+
 def setup_logging():
     """
-    Sets up the logging configuration for the system.
+    Sets up the logging configuration for the system. Only the first call has any effect.
     """
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
     logging.basicConfig(level=getattr(logging, Config.LOGGING_LEVEL),
                         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
                         datefmt='%Y-%m-%d %H:%M:%S')
@@ -24,15 +35,21 @@ def log_system_activity(message, level="INFO"):
     log_function = getattr(logger, level.lower(), logger.info)
     log_function(message)
 
+@lru_cache(maxsize=None)
+def _get_cipher_suite():
+    """
+    Builds the Fernet cipher on first use, so cryptography is only imported when data is actually encrypted.
+    """
+    from cryptography.fernet import Fernet
+    return Fernet(Config.ENCRYPTION_KEY)
+
 def encrypt_data(data):
     """
     Encrypts data using the specified encryption key.
     :param data: Data to encrypt.
     :return: Encrypted data.
     """
-    from cryptography.fernet import Fernet
-    cipher_suite = Fernet(Config.ENCRYPTION_KEY)
-    encrypted_data = cipher_suite.encrypt(data.encode())
+    encrypted_data = _get_cipher_suite().encrypt(data.encode())
     return encrypted_data
 
 def decrypt_data(encrypted_data):
@@ -41,9 +58,7 @@ def decrypt_data(encrypted_data):
     :param encrypted_data: Data to decrypt.
     :return: Decrypted data.
     """
-    from cryptography.fernet import Fernet
-    cipher_suite = Fernet(Config.ENCRYPTION_KEY)
-    decrypted_data = cipher_suite.decrypt(encrypted_data).decode()
+    decrypted_data = _get_cipher_suite().decrypt(encrypted_data).decode()
     return decrypted_data
 
 def authenticate_request(token):
@@ -54,6 +69,42 @@ def authenticate_request(token):
     """
     return token == Config.AUTHENTICATION_TOKEN
 
+def send_message(sock, payload):
+    """
+    Sends one length-prefixed message, so the receiver can reassemble it from any number of TCP chunks.
+    :param sock: Connected socket.
+    :param payload: Message bytes (str is UTF-8 encoded).
+    """
+    if isinstance(payload, str):
+        payload = payload.encode()
+    sock.sendall(struct.pack('!I', len(payload)) + payload)
+
+def _receive_exactly(sock, size):
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(min(size - len(buffer), 65536))
+        if not chunk:
+            if buffer:
+                raise ConnectionError("Connection closed in the middle of a message")
+            return None
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+def receive_message(sock):
+    """
+    Receives one length-prefixed message sent with send_message.
+    :param sock: Connected socket.
+    :return: Message bytes, or None if the peer closed the connection.
+    """
+    header = _receive_exactly(sock, 4)
+    if header is None:
+        return None
+    (size,) = struct.unpack('!I', header)
+    payload = _receive_exactly(sock, size)
+    if payload is None:
+        raise ConnectionError("Connection closed in the middle of a message")
+    return payload
+
 def format_timestamp(timestamp):
     """
     Formats a timestamp into a human-readable string.
@@ -80,4 +131,35 @@ def save_json_file(data, file_path):
     with open(file_path, 'w') as file:
         json.dump(data, file, indent=4)
 
+@contextmanager
+def startup_timer(label):
+    """
+    Records how long the enclosed import or initialization step takes when STARTUP_PROFILE_ENABLED is set.
+    For a per-module breakdown of imports, run the entry point with `python -X importtime`.
+    :param label: Name of the step, e.g. "init TaskScheduler".
+    """
+    if not Config.STARTUP_PROFILE_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _startup_profile.append((label, time.perf_counter() - start))
+
+def report_startup_profile():
+    """
+    Logs the recorded startup steps in the order they ran, followed by the total.
+    :return: List of (label, seconds) pairs.
+    """
+    if not Config.STARTUP_PROFILE_ENABLED:
+        return []
+    entries = list(_startup_profile)
+    log_system_activity("Startup profile:", "INFO")
+    for label, seconds in entries:
+        log_system_activity(f"  {seconds * 1000.0:8.1f} ms  {label}", "INFO")
+    total = sum(seconds for _, seconds in entries)
+    log_system_activity(f"  {total * 1000.0:8.1f} ms  total", "INFO")
+    return entries
+
 # End of utilities.py
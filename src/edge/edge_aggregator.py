@@ -0,0 +1,135 @@
+# edge_aggregator.py
+# Intermediate aggregator running on V2I roadside units in the Distributed Inference System across Tesla Fleet
+
+import json
+import socket
+import threading
+import time
+from src.server.result_aggregator import ResultAggregator
+from src.vehicle.communication import CommunicationModule
+from src.common.utilities import log_system_activity, receive_message
+from src.common.config import Config
+
+class EdgeAggregator(ResultAggregator):
+    def __init__(self, edge_id=None, region=None, upstream=None):
+        """
+        Initializes the EdgeAggregator, which pre-reduces results from nearby vehicles and forwards
+        compact partial aggregates to the central ResultAggregator.
+        :param edge_id: ID of this roadside unit; defaults to Config.EDGE_AGGREGATOR_ID.
+        :param region: Geographic region served; defaults to Config.EDGE_AGGREGATOR_REGION.
+        :param upstream: Connection used to forward partial aggregates; its send_data must return True on success.
+                         Defaults to a CommunicationModule connected to the central partial aggregate port.
+        """
+        super().__init__()
+        self.edge_id = edge_id or Config.EDGE_AGGREGATOR_ID
+        self.region = region or Config.EDGE_AGGREGATOR_REGION
+        self.upstream = upstream or CommunicationModule(port=Config.PARTIAL_AGGREGATE_PORT)
+        self.lock = threading.Lock()  # Guards the pending results
+        self.upstream_lock = threading.Lock()  # Serializes sends and reconnects on the upstream connection
+        self.flush_requested = threading.Event()  # Wakes the flusher thread before its interval elapses
+        self.window_start = time.time()
+
+    def ingest_results(self, encrypted_results):
+        """
+        Collects encrypted results from vehicles and wakes the flusher thread once enough are pending.
+        Upstream I/O never happens on the calling vehicle handler thread.
+        :param encrypted_results: List of encrypted result strings from vehicle nodes.
+        """
+        with self.lock:
+            self.aggregate_results(encrypted_results)
+            pending = len(self.results)
+        if pending >= Config.EDGE_FLUSH_MAX_RESULTS:
+            self.flush_requested.set()
+
+    def flush(self):
+        """
+        Forwards the pending results upstream as a single partial aggregate.
+        If the send fails the partial is kept and included in the next flush.
+        :return: The partial aggregate sent, or None if nothing was pending or the send failed.
+        """
+        with self.upstream_lock:
+            return self._flush()
+
+    def _flush(self):
+        with self.lock:
+            if not self.results and not self.partial_aggregates:
+                return None
+            window_end = time.time()
+            partial = self.build_partial_aggregate(edge_id=self.edge_id, region=self.region,
+                                                   window_start=self.window_start, window_end=window_end)
+            self.clear_results()
+            self.window_start = window_end
+
+        if not self.upstream.send_data(json.dumps(partial)):
+            with self.lock:
+                self.partial_aggregates.append(partial)
+                self.window_start = partial['window_start']
+            log_system_activity(f"Failed to forward partial aggregate of {partial['count']} results, "
+                                "keeping it for the next flush.", "WARNING")
+            self.upstream.close_connection()
+            self.upstream.setup_secure_connection()
+            return None
+        log_system_activity(f"Forwarded partial aggregate of {partial['count']} results upstream.", "INFO")
+        return partial
+
+    def handle_vehicle_connection(self, client_socket, addr):
+        """
+        Receives results from a nearby vehicle until it disconnects.
+        """
+        log_system_activity(f"Connected to vehicle at {addr}", "DEBUG")
+        try:
+            while True:
+                data = receive_message(client_socket)
+                if data is None:
+                    break
+                self.ingest_results([data])
+        except Exception as e:
+            log_system_activity(f"Error handling vehicle connection: {e}", "ERROR")
+        finally:
+            client_socket.close()
+            log_system_activity(f"Connection closed for vehicle at {addr}", "DEBUG")
+
+    def accept_connections(self):
+        """
+        Accepts result deliveries from nearby vehicles and handles them in separate threads.
+        """
+        server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server_socket.bind(('', Config.EDGE_LISTEN_PORT))
+        server_socket.listen(5)
+        log_system_activity(f"Edge aggregator {self.edge_id} listening on port {Config.EDGE_LISTEN_PORT}", "INFO")
+        try:
+            while True:
+                client_socket, addr = server_socket.accept()
+                threading.Thread(target=self.handle_vehicle_connection, args=(client_socket, addr)).start()
+        except Exception as e:
+            log_system_activity(f"Error accepting connections: {e}", "ERROR")
+            server_socket.close()
+
+    def periodic_flush(self):
+        """
+        Forwards a partial aggregate upstream every EDGE_FLUSH_INTERVAL_SECONDS, or earlier when
+        ingest_results signals that EDGE_FLUSH_MAX_RESULTS are pending.
+        """
+        while True:
+            self.flush_requested.wait(Config.EDGE_FLUSH_INTERVAL_SECONDS)
+            self.flush_requested.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                log_system_activity(f"Error forwarding partial aggregate: {e}", "ERROR")
+
+    def run(self):
+        """
+        Runs the edge aggregator: connects upstream, accepts vehicle results and flushes periodically.
+        """
+        if not Config.VEHICLE_TO_INFRASTRUCTURE_COMMUNICATION_ENABLED:
+            log_system_activity("V2I communication disabled, edge aggregator not started.", "WARNING")
+            return
+        log_system_activity(f"Starting edge aggregator {self.edge_id} for region {self.region}", "INFO")
+        self.upstream.setup_secure_connection()
+        threading.Thread(target=self.accept_connections).start()
+        threading.Thread(target=self.periodic_flush).start()
+
+if __name__ == "__main__":
+    edge_aggregator = EdgeAggregator()
+    edge_aggregator.run()
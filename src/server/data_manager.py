@@ -3,8 +3,8 @@
 
 import os
 import json
-from .config import Config
-from .utilities import setup_logging, log_system_activity, encrypt_data, decrypt_data
+from src.common.config import Config
+from src.common.utilities import setup_logging, log_system_activity, encrypt_data, decrypt_data
 
 class DataManager:
     def __init__(self):
@@ -2,8 +2,7 @@
 # Collects and processes results from the vehicles in the Distributed Inference System across Tesla Fleet
 
 import json
-from .config import Config
-from .utilities import setup_logging, log_system_activity, decrypt_data
+from src.common.utilities import setup_logging, log_system_activity, decrypt_data
 
 class ResultAggregator:
     def __init__(self):
@@ -12,24 +11,70 @@ class ResultAggregator:
         """
         setup_logging()
         self.results = []
+        self.partial_aggregates = []  # Pre-reduced results forwarded by edge aggregators
 
     def aggregate_results(self, encrypted_results):
         """
         Aggregates results from multiple vehicle nodes, decrypts them, and processes them for final output.
-        :param encrypted_results: List of encrypted result strings from vehicle nodes.
+        Results that cannot be decrypted or are not plain numbers are logged and skipped.
+        :param encrypted_results: List of encrypted JSON-encoded numeric results from vehicle nodes.
         """
         log_system_activity("Starting aggregation of results.", "INFO")
-        decrypted_results = [decrypt_data(result) for result in encrypted_results]
+        decrypted_results = []
+        for result in encrypted_results:
+            try:
+                value = json.loads(decrypt_data(result))
+            except Exception as e:
+                log_system_activity(f"Skipping unreadable result: {e}", "WARNING")
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                log_system_activity(f"Skipping non-numeric result of type {type(value).__name__}", "WARNING")
+                continue
+            decrypted_results.append(value)
         self.results.extend(decrypted_results)
         log_system_activity(f"Aggregated {len(decrypted_results)} results.", "INFO")
 
+    def aggregate_partial_results(self, encrypted_partials):
+        """
+        Merges partial aggregates forwarded by edge aggregators instead of individual vehicle results.
+        :param encrypted_partials: List of encrypted JSON partial aggregates (see build_partial_aggregate).
+        """
+        log_system_activity("Starting aggregation of partial results.", "INFO")
+        partials = [json.loads(decrypt_data(partial)) for partial in encrypted_partials]
+        self.partial_aggregates.extend(partials)
+        result_count = sum(partial['count'] for partial in partials)
+        log_system_activity(f"Aggregated {len(partials)} partial results covering {result_count} results.", "INFO")
+
+    def reduce_results(self):
+        """
+        Reduces the collected results and partial aggregates into a single value.
+        :return: Reduced value of all results received so far.
+        """
+        # Example processing: Summing up results
+        return sum(self.results) + sum(partial['sum'] for partial in self.partial_aggregates)
+
+    def build_partial_aggregate(self, **metadata):
+        """
+        Builds a compact partial aggregate of everything collected so far, for forwarding upstream.
+        :param metadata: Extra fields to include, such as the edge ID and region.
+        :return: Dict with the reduced 'sum', the number of results it covers as 'count', and the metadata.
+        """
+        count = len(self.results) + sum(partial['count'] for partial in self.partial_aggregates)
+        return dict(metadata, count=count, sum=self.reduce_results())
+
+    def clear_results(self):
+        """
+        Discards the collected results and partial aggregates.
+        """
+        self.results = []
+        self.partial_aggregates = []
+
     def process_final_results(self):
         """
         Processes the aggregated results to produce the final output.
         """
         log_system_activity("Processing final results.", "INFO")
-        # Example processing: Summing up results
-        final_result = sum(self.results)
+        final_result = self.reduce_results()
         log_system_activity(f"Final result computed: {final_result}", "INFO")
         return final_result
 
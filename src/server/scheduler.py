@@ -2,53 +2,264 @@
 # Task scheduler for managing workload distribution among the Tesla Fleet vehicles in the Distributed Inference System
 
 import heapq
+import itertools
 import random
+import time
 from threading import Lock
-from .utilities import log_system_activity
-from .config import Config
+from src.common.utilities import log_system_activity
+from src.common.config import Config
+
+TASK_ASSIGNED = "assigned"
+TASK_QUEUED = "queued"
+TASK_REJECTED = "rejected"
+
+TASK_PREEMPTED = "preempted"
+TASK_EXPIRED = "expired"
+TASK_NODE_REMOVED = "node_removed"
 
 class TaskScheduler:
-    def __init__(self):
+    def __init__(self, on_task_dropped=None):
+        """
+        Initializes the TaskScheduler.
+        :param on_task_dropped: Optional callback(task, reason) invoked, outside the scheduler lock, when a
+                                task is dropped (TASK_PREEMPTED, TASK_EXPIRED or TASK_NODE_REMOVED).
+        """
         self.lock = Lock()
-        self.tasks_queue = []
+        self.tasks_queue = []  # Ready queue of (priority rank, deadline, sequence, task), served earliest deadline first
         self.node_status = {}  # Stores the status of each node (vehicle)
+        self.dropped_tasks = {}  # Task ID -> reason, for tasks dropped since the last pop_dropped_tasks()
+        self.on_task_dropped = on_task_dropped
+        self.queued_load = 0
+        self.fleet_capacity = 0
+        self._sequence = itertools.count()
+        self._pending_drops = []
 
     def schedule_task(self, task):
         """
-        Schedules a task based on the current load and the specified scheduling strategy.
-        :param task: A dictionary containing task details.
+        Schedules a task based on its priority class, deadline and the projected fleet capacity.
+        Tasks that cannot be placed immediately are deferred to the ready queue; tasks that would
+        overload the fleet, or that no single node could ever run, are rejected. Queued lower-priority
+        work is preempted to admit higher-priority tasks where possible.
+        :param task: A dictionary containing task details ('id', 'load', optional 'priority' and 'deadline').
+        :return: TASK_ASSIGNED, TASK_QUEUED or TASK_REJECTED.
         """
         with self.lock:
-            if Config.TASK_ALLOCATION_STRATEGY == "dynamic":
-                self._dynamic_schedule(task)
-            else:
-                self._static_schedule(task)
+            status = self._schedule_task(task)
+        self._notify_dropped()
+        return status
+
+    def _schedule_task(self, task):
+        self._prepare_task(task)
+        self._drop_expired_tasks()
+
+        if task['load'] > self._max_node_capacity():
+            log_system_activity(f"Task {task['id']} rejected: load exceeds the capacity of every node", "WARNING")
+            return TASK_REJECTED
+
+        # A new arrival must not take capacity ahead of queued tasks of a higher priority class
+        blocked_by_queue = self.tasks_queue and self.tasks_queue[0][0] < self._priority_rank(task)
+        node = None if blocked_by_queue else self._select_node(task)
+        if node is not None:
+            self._assign_task_to_node(task, node)
+            return TASK_ASSIGNED
+
+        if Config.ADMISSION_CONTROL_ENABLED and not self._admit_to_queue(task):
+            log_system_activity(f"Task {task['id']} rejected: projected fleet capacity exceeded", "WARNING")
+            return TASK_REJECTED
+
+        self._enqueue_task(task)
+        if not self.node_status:
+            log_system_activity(f"No nodes available, task {task['id']} deferred", "WARNING")
+        else:
+            log_system_activity(f"Task {task['id']} deferred until capacity frees up", "DEBUG")
+        return TASK_QUEUED
+
+    def dispatch_ready_tasks(self):
+        """
+        Assigns queued tasks to nodes with spare capacity, highest priority and earliest deadline first.
+        :return: Number of tasks dispatched.
+        """
+        with self.lock:
+            dispatched = self._dispatch_ready_tasks()
+        self._notify_dropped()
+        return dispatched
+
+    def pop_dropped_tasks(self):
+        """
+        Returns and forgets the tasks dropped since the previous call.
+        :return: Dict of task ID -> reason (TASK_PREEMPTED, TASK_EXPIRED or TASK_NODE_REMOVED).
+        """
+        with self.lock:
+            dropped, self.dropped_tasks = self.dropped_tasks, {}
+        return dropped
+
+    def _prepare_task(self, task):
+        """
+        Fills in the priority class and absolute deadline of a task from the configured defaults.
+        :param task: Task to prepare.
+        """
+        priority = task.setdefault('priority', Config.DEFAULT_TASK_PRIORITY)
+        if priority not in Config.TASK_PRIORITY_CLASSES:
+            log_system_activity(f"Unknown priority '{priority}' for task {task['id']}, using default", "WARNING")
+            task['priority'] = Config.DEFAULT_TASK_PRIORITY
+        task.setdefault('submitted_at', time.time())
+        task.setdefault('deadline', task['submitted_at'] + Config.TASK_DEADLINE_SECONDS[task['priority']])
+
+    def _priority_rank(self, task):
+        return Config.TASK_PRIORITY_CLASSES[task['priority']]
+
+    def _node_capacity(self, node):
+        return self.node_status[node].get('capacity', Config.NODE_LOAD_CAPACITY)
+
+    def _max_node_capacity(self):
+        if not self.node_status:
+            return Config.NODE_LOAD_CAPACITY
+        return max(self._node_capacity(node) for node in self.node_status)
+
+    def _node_has_room(self, node, task):
+        return self.node_status[node]['load'] + task['load'] <= self._node_capacity(node)
+
+    def _select_node(self, task):
+        """
+        Selects a node with room for the task using the configured allocation strategy.
+        :param task: Task to be placed.
+        :return: Node ID, or None if no node can take the task now.
+        """
+        if Config.TASK_ALLOCATION_STRATEGY == "dynamic":
+            return self._dynamic_schedule(task)
+        return self._static_schedule(task)
 
     def _dynamic_schedule(self, task):
         """
         Dynamically schedules tasks based on node performance and current load.
         :param task: Task to be scheduled.
+        :return: The least loaded node with room for the task, or None.
         """
         # Select the node with the least load
-        if not self.node_status:
-            log_system_activity("No nodes available for scheduling", "ERROR")
-            return
+        candidates = [node for node in self.node_status if self._node_has_room(node, task)]
+        if not candidates:
+            return None
 
-        least_loaded_node = min(self.node_status, key=lambda k: self.node_status[k]['load'])
-        self._assign_task_to_node(task, least_loaded_node)
+        return min(candidates, key=lambda k: self.node_status[k]['load'])
 
     def _static_schedule(self, task):
         """
         Statically schedules tasks in a round-robin fashion.
         :param task: Task to be scheduled.
+        :return: A node with room for the task, or None.
         """
-        nodes = list(self.node_status.keys())
+        nodes = [node for node in self.node_status if self._node_has_room(node, task)]
         if not nodes:
-            log_system_activity("No nodes available for scheduling", "ERROR")
+            return None
+
+        return random.choice(nodes)
+
+    def _admit_to_queue(self, task):
+        """
+        Admission control for deferred tasks. The queue is bounded by count and, when nodes are
+        known, by the projected backlog relative to fleet capacity. If the task does not fit,
+        queued tasks of a lower priority class are preempted to make room.
+        :param task: Task waiting for admission.
+        :return: True if the task may be queued.
+        """
+        if not self._queue_overflow(task):
+            return True
+        if not Config.PREEMPTION_ENABLED:
+            return False
+
+        rank = self._priority_rank(task)
+        # Victims: lowest priority first, then the latest deadline
+        victims = sorted((entry for entry in self.tasks_queue if entry[0] > rank),
+                         key=lambda entry: (entry[0], entry[1]), reverse=True)
+        evicted_load = 0
+        for count, entry in enumerate(victims, start=1):
+            evicted_load += entry[3]['load']
+            if not self._queue_overflow(task, count, evicted_load):
+                break
+        else:
+            return False
+
+        evicted = victims[:count]
+        self._remove_queued(evicted)
+        for entry in evicted:
+            log_system_activity(f"Task {entry[3]['id']} preempted by higher-priority task {task['id']}", "WARNING")
+            self._drop_task(entry[3], TASK_PREEMPTED)
+        return True
+
+    def _queue_overflow(self, task, evicted_count=0, evicted_load=0):
+        """
+        Checks whether queueing the task would exceed the ready queue bounds.
+        :param task: Task to be queued.
+        :param evicted_count: Number of queued tasks that would be removed beforehand.
+        :param evicted_load: Total load of those tasks.
+        :return: True if the queue would overflow.
+        """
+        if len(self.tasks_queue) - evicted_count + 1 > Config.MAX_READY_QUEUE_SIZE:
+            return True
+        if not self.node_status:
+            return False
+        projected_load = self.queued_load - evicted_load + task['load']
+        return projected_load > self.fleet_capacity * Config.ADMISSION_BACKLOG_FACTOR
+
+    def _enqueue_task(self, task):
+        heapq.heappush(self.tasks_queue, (self._priority_rank(task), task['deadline'], next(self._sequence), task))
+        self.queued_load += task['load']
+
+    def _remove_queued(self, entries):
+        removed = {id(entry) for entry in entries}
+        self.tasks_queue = [entry for entry in self.tasks_queue if id(entry) not in removed]
+        heapq.heapify(self.tasks_queue)
+        self.queued_load -= sum(entry[3]['load'] for entry in entries)
+
+    def _drop_task(self, task, reason):
+        self.dropped_tasks[task['id']] = reason
+        self._pending_drops.append((task, reason))
+
+    def _notify_dropped(self):
+        """
+        Invokes the drop callback for tasks dropped while the lock was held.
+        """
+        pending, self._pending_drops = self._pending_drops, []
+        if self.on_task_dropped is None:
+            return
+        for task, reason in pending:
+            try:
+                self.on_task_dropped(task, reason)
+            except Exception as e:
+                log_system_activity(f"Error in task drop callback for task {task['id']}: {e}", "ERROR")
+
+    def _drop_expired_tasks(self):
+        """
+        Removes queued tasks whose deadline has already passed.
+        """
+        now = time.time()
+        expired = [entry for entry in self.tasks_queue if entry[1] < now]
+        if not expired:
             return
+        self._remove_queued(expired)
+        for entry in expired:
+            log_system_activity(f"Task {entry[3]['id']} dropped: deadline missed while queued", "WARNING")
+            self._drop_task(entry[3], TASK_EXPIRED)
 
-        node = random.choice(nodes)
-        self._assign_task_to_node(task, node)
+    def _dispatch_ready_tasks(self):
+        self._drop_expired_tasks()
+        dispatched = 0
+        blocked = []
+        while self.tasks_queue:
+            # Smaller tasks of the same class may still fit, but never let a lower class pass a blocked one
+            if blocked and self.tasks_queue[0][0] > blocked[0][0]:
+                break
+            entry = heapq.heappop(self.tasks_queue)
+            node = self._select_node(entry[3])
+            if node is None:
+                blocked.append(entry)
+                continue
+            self.queued_load -= entry[3]['load']
+            self._assign_task_to_node(entry[3], node)
+            dispatched += 1
+        for entry in blocked:
+            heapq.heappush(self.tasks_queue, entry)
+        return dispatched
 
     def _assign_task_to_node(self, task, node):
         """
@@ -63,29 +274,83 @@ class TaskScheduler:
         else:
             log_system_activity(f"Node {node} not found in node status", "ERROR")
 
+    def complete_task(self, node_id, task_id):
+        """
+        Releases the load of a finished task and dispatches queued work to the freed capacity.
+        :param node_id: ID of the node that ran the task.
+        :param task_id: ID of the finished task.
+        """
+        with self.lock:
+            status = self.node_status.get(node_id)
+            if status is None:
+                log_system_activity(f"Node {node_id} not found in scheduler", "ERROR")
+                return
+            for task in status['tasks']:
+                if task['id'] == task_id:
+                    status['tasks'].remove(task)
+                    status['load'] = max(0, status['load'] - task['load'])
+                    log_system_activity(f"Task {task_id} completed on node {node_id}", "INFO")
+                    break
+            else:
+                log_system_activity(f"Task {task_id} not found on node {node_id}", "ERROR")
+            self._dispatch_ready_tasks()
+        self._notify_dropped()
+
     def update_node_status(self, node_id, status):
         """
-        Updates the status of a node.
+        Updates the status of a node and dispatches queued work if capacity became available.
+        The status is merged into the existing entry, so partial heartbeats keep the assigned tasks.
         :param node_id: ID of the node.
         :param status: Status information containing load and other metrics.
         """
         with self.lock:
+            previous = self.node_status.get(node_id)
+            if previous is not None:
+                self.fleet_capacity -= self._node_capacity(node_id)
+                status = dict(previous, **status)
+            else:
+                status = dict({'load': 0, 'tasks': []}, **status)
             self.node_status[node_id] = status
+            self.fleet_capacity += self._node_capacity(node_id)
             log_system_activity(f"Updated status for node {node_id}", "INFO")
+            self._dispatch_ready_tasks()
+        self._notify_dropped()
 
     def remove_node(self, node_id):
         """
-        Removes a node from the scheduler.
+        Removes a node from the scheduler. Its assigned tasks are requeued, or reported as
+        TASK_NODE_REMOVED if admission control has no room for them.
         :param node_id: ID of the node to be removed.
         """
         with self.lock:
             if node_id in self.node_status:
-                del self.node_status[node_id]
+                self.fleet_capacity -= self._node_capacity(node_id)
+                orphaned = self.node_status.pop(node_id)['tasks']
                 log_system_activity(f"Node {node_id} removed from scheduler", "INFO")
+                self._requeue_tasks(orphaned)
+                self._dispatch_ready_tasks()
             else:
                 log_system_activity(f"Node {node_id} not found in scheduler", "ERROR")
+        self._notify_dropped()
+
+    def _requeue_tasks(self, tasks):
+        """
+        Returns tasks from a removed node to the ready queue, highest priority first.
+        :param tasks: Tasks that were assigned to the removed node.
+        """
+        for task in sorted(tasks, key=lambda task: (self._priority_rank(task), task['deadline'])):
+            if task['load'] > self._max_node_capacity() or \
+                    (Config.ADMISSION_CONTROL_ENABLED and not self._admit_to_queue(task)):
+                log_system_activity(f"Task {task['id']} dropped: its node was removed and it could not be requeued",
+                                    "WARNING")
+                self._drop_task(task, TASK_NODE_REMOVED)
+                continue
+            self._enqueue_task(task)
+            log_system_activity(f"Task {task['id']} requeued after its node was removed", "INFO")
 
 # Example usage:
-# scheduler = TaskScheduler()
-# scheduler.update_node_status('node1', {'load': 10, 'tasks': []})
-# scheduler.schedule_task({'id': 'task1', 'load': 5})
+# scheduler = TaskScheduler(on_task_dropped=lambda task, reason: print(task['id'], reason))
+# scheduler.update_node_status('node1', {'load': 10, 'tasks': [], 'capacity': 100})
+# scheduler.schedule_task({'id': 'task1', 'load': 5, 'priority': 'critical'})
+# scheduler.schedule_task({'id': 'task2', 'load': 50, 'priority': 'batch', 'deadline': time.time() + 3600})
+# scheduler.complete_task('node1', 'task1')
@@ -3,19 +3,31 @@
 
 import threading
 import socket
-from .scheduler import TaskScheduler
-from .data_manager import DataManager
-from .result_aggregator import ResultAggregator
-from .utilities import setup_logging, log_system_activity
-from .config import Config
+from src.common.utilities import (setup_logging, log_system_activity, send_message, receive_message, startup_timer,
+                                  report_startup_profile)
+from src.common.config import Config
+
+# Timed individually so the startup profile shows which server module is slow to import
+with startup_timer("import scheduler"):
+    from .scheduler import TaskScheduler
+with startup_timer("import data_manager"):
+    from .data_manager import DataManager
+with startup_timer("import result_aggregator"):
+    from .result_aggregator import ResultAggregator
 
 class ServerMain:
     def __init__(self):
         setup_logging()
-        self.scheduler = TaskScheduler()
-        self.data_manager = DataManager()
-        self.result_aggregator = ResultAggregator()
-        self.server_socket = self.setup_server_socket()
+        with startup_timer("init TaskScheduler"):
+            self.scheduler = TaskScheduler()
+        with startup_timer("init DataManager"):
+            self.data_manager = DataManager()
+        with startup_timer("init ResultAggregator"):
+            self.result_aggregator = ResultAggregator()
+        with startup_timer("init server socket"):
+            self.server_socket = self.setup_server_socket()
+            self.partial_aggregate_socket = self.setup_partial_aggregate_socket()
+        report_startup_profile()
 
     def setup_server_socket(self):
         """
@@ -27,6 +39,45 @@ class ServerMain:
         log_system_activity("Server socket setup and listening", "INFO")
         return server_socket
 
+    def setup_partial_aggregate_socket(self):
+        """
+        Sets up the socket on which edge aggregators deliver partial aggregates.
+        """
+        partial_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        partial_socket.bind(('', Config.PARTIAL_AGGREGATE_PORT))
+        partial_socket.listen(5)
+        log_system_activity(f"Partial aggregate socket listening on port {Config.PARTIAL_AGGREGATE_PORT}", "INFO")
+        return partial_socket
+
+    def handle_edge_connection(self, client_socket, addr):
+        """
+        Handles the connection from an edge aggregator, merging each partial aggregate it forwards.
+        """
+        log_system_activity(f"Connected to edge aggregator at {addr}", "INFO")
+        try:
+            while True:
+                data = receive_message(client_socket)
+                if data is None:
+                    break
+                self.result_aggregator.aggregate_partial_results([data])
+        except Exception as e:
+            log_system_activity(f"Error handling edge aggregator connection: {e}", "ERROR")
+        finally:
+            client_socket.close()
+            log_system_activity(f"Connection closed for edge aggregator at {addr}", "INFO")
+
+    def accept_edge_connections(self):
+        """
+        Accepts incoming connections from edge aggregators and handles them in separate threads.
+        """
+        try:
+            while True:
+                client_socket, addr = self.partial_aggregate_socket.accept()
+                threading.Thread(target=self.handle_edge_connection, args=(client_socket, addr)).start()
+        except Exception as e:
+            log_system_activity(f"Error accepting edge aggregator connections: {e}", "ERROR")
+            self.partial_aggregate_socket.close()
+
     def handle_vehicle_connection(self, client_socket, addr):
         """
         Handles the connection from a vehicle, processing incoming data and sending tasks.
@@ -34,12 +85,12 @@ class ServerMain:
         log_system_activity(f"Connected to vehicle at {addr}", "INFO")
         try:
             while True:
-                data = client_socket.recv(1024)
-                if not data:
+                data = receive_message(client_socket)
+                if data is None:
                     break
                 processed_data = self.data_manager.process_incoming_data(data)
                 task = self.scheduler.allocate_task(processed_data)
-                client_socket.send(task)
+                send_message(client_socket, task)
         except Exception as e:
             log_system_activity(f"Error handling vehicle connection: {e}", "ERROR")
         finally:
@@ -70,6 +121,7 @@ class ServerMain:
         """
         log_system_activity("Starting server main functionalities", "INFO")
         threading.Thread(target=self.accept_connections).start()
+        threading.Thread(target=self.accept_edge_connections).start()
         threading.Thread(target=self.aggregate_results).start()
 
 if __name__ == "__main__":
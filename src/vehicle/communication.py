@@ -3,13 +3,18 @@
 
 import socket
 import ssl
-from .utilities import encrypt_data, decrypt_data, log_system_activity
-from .config import Config
+from src.common.utilities import encrypt_data, decrypt_data, log_system_activity, send_message, receive_message
+from src.common.config import Config
 
 class CommunicationModule:
-    def __init__(self):
+    def __init__(self, port=443):
+        """
+        Initializes the CommunicationModule.
+        :param port: Port of the VPN endpoint to connect to.
+        """
         self.server_address = Config.SERVER_URL
         self.vpn_endpoint = Config.VPN_TUNNEL_ENDPOINT
+        self.port = port
         self.socket = None
 
     def setup_secure_connection(self):
@@ -25,22 +30,25 @@ class CommunicationModule:
                                           cert_reqs=ssl.CERT_NONE, ssl_version=ssl.PROTOCOL_TLSv1_2)
             
             # Connect to the VPN tunnel
-            self.socket.connect((self.vpn_endpoint, 443))
+            self.socket.connect((self.vpn_endpoint, self.port))
             log_system_activity("Secure connection established with VPN endpoint.", "INFO")
         except Exception as e:
             log_system_activity(f"Failed to establish secure connection: {str(e)}", "ERROR")
 
     def send_data(self, data):
         """
-        Sends encrypted data to the server.
+        Sends encrypted data to the server as one framed message.
         :param data: Data to send (str).
+        :return: True if the data was sent, False otherwise.
         """
         try:
             encrypted_data = encrypt_data(data)
-            self.socket.sendall(encrypted_data)
+            send_message(self.socket, encrypted_data)
             log_system_activity("Data sent to server successfully.", "DEBUG")
+            return True
         except Exception as e:
             log_system_activity(f"Error sending data: {str(e)}", "ERROR")
+            return False
 
     def receive_data(self):
         """
@@ -48,7 +56,7 @@ class CommunicationModule:
         :return: Decrypted data (str).
         """
         try:
-            received_data = self.socket.recv(1024)  # Buffer size
+            received_data = receive_message(self.socket)
             decrypted_data = decrypt_data(received_data)
             log_system_activity("Data received and decrypted successfully.", "DEBUG")
             return decrypted_data
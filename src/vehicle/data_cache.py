@@ -1,10 +1,11 @@
 # data_cache.py
 # Manages local caching of data needed for quick access during computation in Tesla vehicles.
 
+import base64
 import os
 import pickle
-from .config import Config
-from .utilities import log_system_activity, encrypt_data, decrypt_data
+from src.common.config import Config
+from src.common.utilities import log_system_activity, encrypt_data, decrypt_data
 
 class DataCache:
     def __init__(self):
@@ -26,7 +27,8 @@ class DataCache:
         :param data: The data to store.
         """
         file_path = os.path.join(self.cache_path, f"{key}.cache")
-        encrypted_data = encrypt_data(pickle.dumps(data))
+        # encrypt_data works on text, so the pickled bytes are base64 encoded first
+        encrypted_data = encrypt_data(base64.b64encode(pickle.dumps(data)).decode('ascii'))
         with open(file_path, 'wb') as file:
             file.write(encrypted_data)
         log_system_activity(f"Data stored in cache under key {key}", level="DEBUG")
@@ -41,7 +43,7 @@ class DataCache:
         if os.path.exists(file_path):
             with open(file_path, 'rb') as file:
                 encrypted_data = file.read()
-                data = pickle.loads(decrypt_data(encrypted_data))
+                data = pickle.loads(base64.b64decode(decrypt_data(encrypted_data)))
                 log_system_activity(f"Data retrieved from cache for key {key}", level="DEBUG")
                 return data
         log_system_activity(f"No data found in cache for key {key}", level="WARNING")
@@ -1,23 +1,51 @@
 # inference_engine.py
 # Module to execute inference tasks using the vehicle’s GPU in the Distributed Inference System across Tesla Fleet
 
+import base64
+import json
+import os
+import time
 import numpy as np
-import tensorflow as tf
-from tensorflow.keras.models import load_model
-from .communication import send_results_to_server
-from .data_cache import get_cached_data
-from .utilities import log_system_activity, setup_logging
-from .config import Config
+from .communication import CommunicationModule
+from .data_cache import DataCache
+from src.common.utilities import log_system_activity, setup_logging
+from src.common.config import Config
 
 setup_logging()
 
+PRECISION_MODES = ("float32", "float16", "int8")
+RESULT_ENCODINGS = ("full", "float16", "top_k")
+PRECISION_FALLBACK = {"int8": "float16", "float16": "float32"}  # Used when no TFLite model exists for a mode
+
 class InferenceEngine:
-    def __init__(self):
+    def __init__(self, precision=None, result_encoding=None, communication=None):
         """
         Initializes the Inference Engine with the necessary model and configurations.
+        :param precision: Input precision ('float32', 'float16', 'int8'); defaults to Config.INFERENCE_PRECISION.
+        :param result_encoding: Result encoding ('full', 'float16', 'top_k'); defaults to Config.RESULT_ENCODING.
+        :param communication: Module used to send results; defaults to a new CommunicationModule.
         """
-        self.model = self.load_model()
-        log_system_activity("Inference Engine initialized.", "INFO")
+        self.precision = precision or Config.INFERENCE_PRECISION
+        self.result_encoding = result_encoding or Config.RESULT_ENCODING
+        if self.precision not in PRECISION_MODES:
+            log_system_activity(f"Unknown precision '{self.precision}', using float32.", "WARNING")
+            self.precision = "float32"
+        if self.result_encoding not in RESULT_ENCODINGS:
+            log_system_activity(f"Unknown result encoding '{self.result_encoding}', using full.", "WARNING")
+            self.result_encoding = "full"
+
+        self.communication = communication or CommunicationModule()
+        self.quantized_model = None
+        while self.precision != "float32":
+            self.quantized_model = self.load_quantized_model()
+            if self.quantized_model is not None:
+                break
+            fallback = PRECISION_FALLBACK[self.precision]
+            log_system_activity(f"No {self.precision} model available, falling back to {fallback}.", "WARNING")
+            self.precision = fallback
+        # Only keep the full Keras model in memory when there is no reduced-precision model to run
+        self.model = self.load_model() if self.quantized_model is None else None
+        log_system_activity(f"Inference Engine initialized ({self.precision}, {self.result_encoding} results).", "INFO")
 
     def load_model(self):
         """
@@ -25,6 +53,8 @@ class InferenceEngine:
         :return: Loaded TensorFlow model.
         """
         try:
+            # TensorFlow takes seconds to import, so defer it until a model is actually needed
+            from tensorflow.keras.models import load_model
             model = load_model(Config.MODEL_PATH)
             log_system_activity("Model loaded successfully.", "INFO")
             return model
@@ -32,19 +62,41 @@ class InferenceEngine:
             log_system_activity(f"Failed to load model: {str(e)}", "ERROR")
             return None
 
+    def load_quantized_model(self):
+        """
+        Loads the TensorFlow Lite model exported for the configured precision, if there is one.
+        :return: Allocated TFLite interpreter, or None if unavailable.
+        """
+        model_path = Config.FLOAT16_MODEL_PATH if self.precision == "float16" else Config.QUANTIZED_MODEL_PATH
+        if not model_path or not os.path.exists(model_path):
+            log_system_activity(f"No {self.precision} model found at {model_path}.", "DEBUG")
+            return None
+        try:
+            import tensorflow as tf
+            interpreter = tf.lite.Interpreter(model_path=model_path)
+            interpreter.allocate_tensors()
+            log_system_activity("Quantized model loaded successfully.", "INFO")
+            return interpreter
+        except Exception as e:
+            log_system_activity(f"Failed to load quantized model: {str(e)}", "ERROR")
+            return None
+
     def perform_inference(self, data):
         """
         Performs inference on the provided data using the loaded model.
         :param data: Data on which inference is to be performed.
         :return: Inference results.
         """
-        if self.model is None:
+        if self.model is None and self.quantized_model is None:
             log_system_activity("Model is not loaded, cannot perform inference.", "ERROR")
             return None
 
         try:
             preprocessed_data = self.preprocess_data(data)
-            predictions = self.model.predict(preprocessed_data)
+            if self.quantized_model is not None:
+                predictions = self._predict_quantized(preprocessed_data)
+            else:
+                predictions = self.model.predict(preprocessed_data)
             log_system_activity("Inference performed successfully.", "INFO")
             return predictions
         except Exception as e:
@@ -54,27 +106,190 @@ class InferenceEngine:
     def preprocess_data(self, data):
         """
         Preprocesses the data before feeding it into the model.
+        Normalization is done directly in the model's input dtype to avoid a float64 intermediate.
         :param data: Raw data to preprocess.
         :return: Preprocessed data.
         """
+        if self.quantized_model is not None:
+            # The TFLite model's input tensor decides the path: dynamic-range and float16 models take floats
+            input_details = self.quantized_model.get_input_details()[0]
+            dtype = np.dtype(input_details['dtype'])
+            if np.issubdtype(dtype, np.integer):
+                return self._quantize_input(data, dtype, input_details['quantization'])
+        else:
+            dtype = np.dtype(np.float32)
         # Example preprocessing: normalize data
-        return data / 255.0
+        return np.multiply(data, dtype.type(1.0 / 255.0), dtype=dtype)
+
+    def _quantize_input(self, data, dtype, quantization):
+        """
+        Maps raw 0-255 data onto the integer input of a fully quantized model.
+        :param data: Raw data to quantize.
+        :param dtype: Integer input dtype of the model.
+        :param quantization: (scale, zero_point) of the model input; a zero scale means raw integers are expected.
+        :return: Quantized data in the model's input dtype.
+        """
+        scale, zero_point = quantization
+        if scale <= 0:
+            return np.asarray(data).astype(dtype)
+        quantized = np.round(np.multiply(data, 1.0 / (255.0 * scale), dtype=np.float32) + zero_point)
+        limits = np.iinfo(dtype)
+        return np.clip(quantized, limits.min, limits.max).astype(dtype)
 
-    def handle_inference_task(self):
+    def _predict_quantized(self, data):
+        """
+        Runs a batch through the TFLite interpreter and dequantizes integer outputs.
+        :param data: Preprocessed input batch.
+        :return: Predictions as a float array.
+        """
+        interpreter = self.quantized_model
+        input_details = interpreter.get_input_details()[0]
+        if tuple(input_details['shape']) != data.shape:
+            interpreter.resize_tensor_input(input_details['index'], data.shape)
+            interpreter.allocate_tensors()
+        interpreter.set_tensor(input_details['index'], data.astype(input_details['dtype'], copy=False))
+        interpreter.invoke()
+
+        output_details = interpreter.get_output_details()[0]
+        output = interpreter.get_tensor(output_details['index'])
+        if np.issubdtype(output.dtype, np.integer):
+            scale, zero_point = output_details['quantization']
+            output = (output.astype(np.float32) - zero_point) * scale
+        return output
+
+    def encode_results(self, predictions):
+        """
+        Compacts the predictions according to the configured result encoding before transmission.
+        :param predictions: Model output of shape (batch, classes).
+        :return: Full predictions, float16 predictions, or a dict of top-k 'indices' and 'scores'.
+        """
+        predictions = np.asarray(predictions)
+        if self.result_encoding == "float16":
+            return predictions.astype(np.float16)
+        if self.result_encoding == "top_k":
+            k = min(Config.RESULT_TOP_K, predictions.shape[-1])
+            indices = np.argpartition(predictions, -k, axis=-1)[..., -k:]
+            scores = np.take_along_axis(predictions, indices, axis=-1)
+            order = np.argsort(-scores, axis=-1)
+            return {
+                'indices': np.take_along_axis(indices, order, axis=-1).astype(np.int32),
+                'scores': np.take_along_axis(scores, order, axis=-1).astype(np.float16),
+            }
+        return predictions
+
+    def handle_inference_task(self, cache_key):
         """
         Handles an inference task by fetching data, performing inference, and sending results back.
+        :param cache_key: Key under which the task's input data is stored in the local cache.
         """
-        data = get_cached_data()
+        data = DataCache().retrieve_data(cache_key)
         if data is not None:
             results = self.perform_inference(data)
-            if results is not None:
-                send_results_to_server(results)
+            if results is not None and self.communication.send_data(serialize_results(self.encode_results(results))):
                 log_system_activity("Results sent to server.", "INFO")
             else:
                 log_system_activity("Failed to perform inference or send results.", "ERROR")
         else:
             log_system_activity("No data available for inference.", "ERROR")
 
+def _serialize_array(array):
+    return {'dtype': str(array.dtype), 'shape': list(array.shape),
+            'data': base64.b64encode(np.ascontiguousarray(array).tobytes()).decode('ascii')}
+
+def serialize_results(encoded):
+    """
+    Serializes encoded results to JSON, keeping arrays as base64 raw bytes so float16 and top-k stay compact.
+    :param encoded: Output of InferenceEngine.encode_results.
+    :return: JSON string.
+    """
+    if isinstance(encoded, dict):
+        return json.dumps({key: _serialize_array(value) for key, value in encoded.items()})
+    return json.dumps(_serialize_array(np.asarray(encoded)))
+
+def deserialize_results(payload):
+    """
+    Restores results serialized with serialize_results.
+    :param payload: JSON string.
+    :return: Array, or dict of arrays for top-k results.
+    """
+    def restore(item):
+        data = base64.b64decode(item['data'])
+        return np.frombuffer(data, dtype=item['dtype']).reshape(item['shape'])
+    decoded = json.loads(payload)
+    if 'data' in decoded:
+        return restore(decoded)
+    return {key: restore(value) for key, value in decoded.items()}
+
+def _encoded_size(encoded):
+    if isinstance(encoded, dict):
+        return sum(value.nbytes for value in encoded.values())
+    return np.asarray(encoded).nbytes
+
+def _compare_encoding(encoded, baseline):
+    """
+    Measures how much of the float32 baseline an encoded result preserves.
+    :param encoded: Output of InferenceEngine.encode_results.
+    :param baseline: Full float32 predictions of the baseline mode.
+    :return: Dict with top-1 agreement, top-k recall of the baseline top-1 class and max absolute error.
+    """
+    baseline_top1 = np.argmax(baseline, axis=-1)
+    if isinstance(encoded, dict):
+        indices = encoded['indices']
+        kept_baseline = np.take_along_axis(baseline, indices.astype(np.intp), axis=-1)
+        return {
+            'top1_agreement': float(np.mean(indices[..., 0] == baseline_top1)),
+            'topk_recall': float(np.mean(np.any(indices == baseline_top1[..., None], axis=-1))),
+            'max_abs_error': float(np.max(np.abs(encoded['scores'].astype(np.float32) - kept_baseline))),
+        }
+    predictions = np.asarray(encoded, dtype=np.float32)
+    agreement = float(np.mean(np.argmax(predictions, axis=-1) == baseline_top1))
+    return {
+        'top1_agreement': agreement,
+        'topk_recall': agreement,
+        'max_abs_error': float(np.max(np.abs(predictions - baseline))),
+    }
+
+def generate_precision_report(data, modes=PRECISION_MODES, encodings=RESULT_ENCODINGS, runs=5):
+    """
+    Compares precision modes and result encodings against the float32 baseline so they can be chosen per model.
+    :param data: Representative raw input batch.
+    :param modes: Precision modes to evaluate.
+    :param encodings: Result encodings to evaluate for each mode.
+    :param runs: Number of timed inference runs per mode.
+    :return: List of dicts, one per mode and encoding, with latency, result size, top-1 agreement,
+             top-k recall of the baseline top-1 class and max absolute error.
+    """
+    baseline = None
+    report = []
+    for mode in ("float32",) + tuple(m for m in modes if m != "float32"):
+        engine = InferenceEngine(precision=mode)
+        if engine.precision != mode:
+            log_system_activity(f"Skipping {mode} in precision report: mode not supported by this model.", "WARNING")
+            continue
+        predictions = engine.perform_inference(data)  # Warm-up run
+        if predictions is None:
+            if baseline is None:
+                log_system_activity("Precision report aborted: float32 baseline inference failed.", "ERROR")
+                return report
+            log_system_activity(f"Skipping {mode} in precision report: inference failed.", "WARNING")
+            continue
+        start = time.perf_counter()
+        for _ in range(runs):
+            engine.perform_inference(data)
+        latency_ms = (time.perf_counter() - start) * 1000.0 / runs
+
+        if baseline is None:
+            baseline = np.asarray(predictions, dtype=np.float32)
+        for encoding in encodings:
+            engine.result_encoding = encoding
+            encoded = engine.encode_results(predictions)
+            entry = dict({'mode': mode, 'encoding': encoding, 'latency_ms': latency_ms,
+                          'result_bytes': _encoded_size(encoded)}, **_compare_encoding(encoded, baseline))
+            report.append(entry)
+            log_system_activity(f"Precision report {mode}/{encoding}: {entry}", "INFO")
+    return report
+
 if __name__ == "__main__":
     inference_engine = InferenceEngine()
-    inference_engine.handle_inference_task()
+    inference_engine.communication.setup_secure_connection()
+    inference_engine.handle_inference_task("inference_input")
@@ -1,17 +1,41 @@
 # vehicle_main.py
 # Main script running on each Tesla vehicle for the Distributed Inference System
 
+import json
 import threading
 import time
-from .communication import send_data, receive_instructions
-from .inference_engine import process_inference_task
-from .data_cache import cache_data, retrieve_cached_data
-from src.common.utilities import setup_logging, log_system_activity, encrypt_data, decrypt_data
+from src.common.utilities import setup_logging, log_system_activity, startup_timer, report_startup_profile
 from src.common.config import Config
 
+# Timed individually so the startup profile shows which vehicle module is slow to import
+with startup_timer("import communication"):
+    from .communication import CommunicationModule
+with startup_timer("import inference_engine"):
+    from .inference_engine import InferenceEngine, serialize_results
+with startup_timer("import data_cache"):
+    from .data_cache import DataCache
+
+# Created once at startup by main()
+communication = None
+data_cache = None
+inference_engine = None
+
+pending_task_ids = set()  # Cached tasks not yet claimed for processing
+pending_lock = threading.Lock()
+
 def main():
+    global communication, data_cache, inference_engine
     setup_logging()
     log_system_activity("Vehicle node starting up.", "INFO")
+    with startup_timer("init CommunicationModule"):
+        communication = CommunicationModule()
+        communication.setup_secure_connection()
+    with startup_timer("init DataCache"):
+        data_cache = DataCache()
+    # Loading the model is what pulls in TensorFlow, so it belongs in the startup profile
+    with startup_timer("init InferenceEngine"):
+        inference_engine = InferenceEngine(communication=communication)
+    report_startup_profile()
 
     # Main loop
     while True:
@@ -35,14 +59,26 @@ def main():
             if Config.AUTO_RECOVERY_ENABLED:
                 recover_from_error(e)
 
+def receive_instructions():
+    """
+    Receive the next instructions from the central server.
+    :return: Dict of instructions, or None if nothing was received.
+    """
+    message = communication.receive_data()
+    if not message:
+        return None
+    return json.loads(message)
+
 def handle_instructions(instructions):
     """
     Handle instructions received from the central server.
     :param instructions: Dict containing task details and commands.
     """
     if 'task' in instructions:
-        task_data = decrypt_data(instructions['task'])
-        cache_data(task_data['id'], task_data)
+        task_data = instructions['task']
+        data_cache.store_data(task_data['id'], task_data)
+        with pending_lock:
+            pending_task_ids.add(task_data['id'])
         log_system_activity(f"Task {task_data['id']} cached for processing.", "INFO")
 
         # Start a new thread to handle the task processing
@@ -53,19 +89,31 @@ def handle_cached_tasks():
     """
     Process tasks that are cached locally if no new instructions are received.
     """
-    cached_tasks = retrieve_cached_data()
-    for task_id, task_data in cached_tasks.items():
-        log_system_activity(f"Processing cached task {task_id}.", "INFO")
-        process_task(task_data)
+    with pending_lock:
+        task_ids = list(pending_task_ids)
+    for task_id in task_ids:
+        task_data = data_cache.retrieve_data(task_id)
+        if task_data is not None:
+            log_system_activity(f"Processing cached task {task_id}.", "INFO")
+            process_task(task_data)
 
 def process_task(task_data):
     """
     Process a single inference task using the vehicle's GPU.
-    :param task_data: Data necessary for the inference task.
+    :param task_data: Dict with the task 'id' and its input 'data'.
     """
-    result = process_inference_task(task_data)
-    send_data(encrypt_data(result))
-    log_system_activity(f"Task {task_data['id']} processed and result sent.", "INFO")
+    with pending_lock:
+        if task_data['id'] not in pending_task_ids:
+            return  # Already claimed by another thread
+        pending_task_ids.discard(task_data['id'])
+
+    results = inference_engine.perform_inference(task_data['data'])
+    if results is None:
+        log_system_activity(f"Task {task_data['id']} failed during inference.", "ERROR")
+        return
+    payload = json.dumps({'id': task_data['id'], 'results': serialize_results(inference_engine.encode_results(results))})
+    if communication.send_data(payload):
+        log_system_activity(f"Task {task_data['id']} processed and result sent.", "INFO")
 
 def monitor_system_health():
     """
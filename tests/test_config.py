@@ -0,0 +1,71 @@
+# test_config.py
+# Tests for loading, overriding and freezing the configuration
+
+import copy
+import json
+import pickle
+import pytest
+from src.common.config import DefaultConfig, FrozenConfig, load_config
+
+def fresh_config(config_path=None):
+    # Bypass the cache so each test sees its own file and environment
+    return load_config.__wrapped__(config_path)
+
+@pytest.fixture
+def config_file(tmp_path):
+    def write(values):
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps(values))
+        return str(path)
+    return write
+
+def test_defaults_are_loaded():
+    config = fresh_config()
+    assert config.SYSTEM_NAME == DefaultConfig.SYSTEM_NAME
+    assert config.TASK_PRIORITY_CLASSES["critical"] == 0
+
+def test_file_overrides_defaults_and_env_overrides_file(config_file, monkeypatch):
+    path = config_file({"CHECK_INTERVAL": 10, "LOGGING_LEVEL": "DEBUG"})
+    monkeypatch.setenv("TESLA_FLEET_CHECK_INTERVAL", "20")
+    config = fresh_config(path)
+    assert config.CHECK_INTERVAL == 20
+    assert config.LOGGING_LEVEL == "DEBUG"
+    assert config.MAX_READY_QUEUE_SIZE == DefaultConfig.MAX_READY_QUEUE_SIZE
+
+def test_unknown_file_setting_is_rejected(config_file):
+    with pytest.raises(ValueError, match="CHEK_INTERVAL"):
+        fresh_config(config_file({"CHEK_INTERVAL": 10}))
+
+def test_env_values_follow_the_default_type(monkeypatch):
+    monkeypatch.setenv("TESLA_FLEET_DEBUG_MODE", "False")
+    monkeypatch.setenv("TESLA_FLEET_AUTO_RECOVERY_ENABLED", "no")
+    monkeypatch.setenv("TESLA_FLEET_AUTHENTICATION_TOKEN", "12345")
+    monkeypatch.setenv("TESLA_FLEET_ADMISSION_BACKLOG_FACTOR", "3")
+    monkeypatch.setenv("TESLA_FLEET_TASK_DEADLINE_SECONDS", '{"critical": 1}')
+    config = fresh_config()
+    assert config.DEBUG_MODE is False
+    assert config.AUTO_RECOVERY_ENABLED is False
+    assert config.AUTHENTICATION_TOKEN == "12345"
+    assert config.ADMISSION_BACKLOG_FACTOR == 3.0
+    assert config.TASK_DEADLINE_SECONDS["critical"] == 1
+
+def test_invalid_env_value_is_rejected(monkeypatch):
+    monkeypatch.setenv("TESLA_FLEET_DEBUG_MODE", "maybe")
+    with pytest.raises(ValueError, match="TESLA_FLEET_DEBUG_MODE"):
+        fresh_config()
+
+def test_config_is_immutable():
+    config = fresh_config()
+    with pytest.raises(AttributeError):
+        config.DEBUG_MODE = True
+    with pytest.raises(TypeError):
+        config.TASK_PRIORITY_CLASSES["critical"] = 5
+
+def test_load_config_is_cached():
+    assert load_config() is load_config()
+
+def test_config_can_be_copied_and_pickled():
+    config = fresh_config()
+    assert copy.copy(config).as_dict() == config.as_dict()
+    assert pickle.loads(pickle.dumps(config)).TASK_PRIORITY_CLASSES == config.TASK_PRIORITY_CLASSES
+    assert isinstance(copy.deepcopy(config), FrozenConfig)
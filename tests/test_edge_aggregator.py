@@ -0,0 +1,106 @@
+# test_edge_aggregator.py
+# Tests for partial aggregation at the edge tier and merging at the central ResultAggregator
+
+import json
+import socket
+from src.common.config import Config
+from src.common.utilities import encrypt_data, decrypt_data, send_message, receive_message
+from src.edge.edge_aggregator import EdgeAggregator
+from src.server.result_aggregator import ResultAggregator
+from src.vehicle.communication import CommunicationModule
+
+class FakeUpstream:
+    def __init__(self, succeed=True):
+        self.succeed = succeed
+        self.sent = []
+        self.reconnects = 0
+
+    def send_data(self, data):
+        if self.succeed:
+            self.sent.append(json.loads(data))
+        return self.succeed
+
+    def close_connection(self):
+        pass
+
+    def setup_secure_connection(self):
+        self.reconnects += 1
+
+def encrypted(values):
+    return [encrypt_data(json.dumps(value)) for value in values]
+
+def test_flush_forwards_count_and_sum():
+    upstream = FakeUpstream()
+    edge = EdgeAggregator(edge_id='edge-1', region='north', upstream=upstream)
+    edge.ingest_results(encrypted([1, 2.5, 4]))
+
+    partial = edge.flush()
+    assert partial['count'] == 3
+    assert partial['sum'] == 7.5
+    assert partial['edge_id'] == 'edge-1'
+    assert upstream.sent == [partial]
+    assert edge.results == []
+    assert edge.flush() is None
+
+def test_failed_send_keeps_partial_for_next_flush():
+    upstream = FakeUpstream(succeed=False)
+    edge = EdgeAggregator(upstream=upstream)
+    edge.ingest_results(encrypted([1, 2]))
+    assert edge.flush() is None
+    assert upstream.reconnects == 1
+
+    upstream.succeed = True
+    edge.ingest_results(encrypted([3]))
+    partial = edge.flush()
+    assert (partial['count'], partial['sum']) == (3, 6)
+
+def test_central_aggregator_merges_partials_and_vehicle_results():
+    aggregator = ResultAggregator()
+    aggregator.aggregate_results(encrypted([10]))
+    partials = [{'edge_id': 'a', 'count': 3, 'sum': 6}, {'edge_id': 'b', 'count': 2, 'sum': 4}]
+    aggregator.aggregate_partial_results(encrypted(partials))
+
+    assert aggregator.process_final_results() == 20
+    assert aggregator.build_partial_aggregate()['count'] == 6
+
+def test_framed_messages_survive_chunking():
+    sender, receiver = socket.socketpair()
+    try:
+        payload = encrypt_data("x" * 5000)
+        send_message(sender, payload)
+        sender.close()
+        assert decrypt_data(receive_message(receiver)) == "x" * 5000
+        assert receive_message(receiver) is None
+    finally:
+        receiver.close()
+
+def test_non_numeric_results_are_skipped():
+    upstream = FakeUpstream()
+    edge = EdgeAggregator(upstream=upstream)
+    edge.ingest_results(encrypted([1, [0.1, 0.9], {'indices': [1]}, True, "2", 2]))
+    edge.ingest_results([b"not a fernet token"])
+    assert edge.results == [1, 2]
+
+    partial = edge.flush()
+    assert (partial['count'], partial['sum']) == (2, 3)
+
+def test_ingest_wakes_flusher_instead_of_sending():
+    upstream = FakeUpstream()
+    edge = EdgeAggregator(upstream=upstream)
+    edge.ingest_results(encrypted([1] * Config.EDGE_FLUSH_MAX_RESULTS))
+    assert edge.flush_requested.is_set()
+    assert upstream.sent == []
+
+def test_communication_module_sends_framed_messages():
+    sender, receiver = socket.socketpair()
+    try:
+        comm = CommunicationModule()
+        comm.socket = sender
+        assert comm.send_data("y" * 3000)
+        assert decrypt_data(receive_message(receiver)) == "y" * 3000
+
+        send_message(receiver, encrypt_data("reply"))
+        assert comm.receive_data() == "reply"
+    finally:
+        sender.close()
+        receiver.close()
@@ -0,0 +1,147 @@
+# test_inference_engine.py
+# Tests for the reduced-precision inference path and result encoding, using fake models instead of TensorFlow
+
+import numpy as np
+import pytest
+from src.vehicle import inference_engine as engine_module
+from src.vehicle.inference_engine import (InferenceEngine, generate_precision_report, serialize_results,
+                                          deserialize_results)
+
+WEIGHTS = np.array([[1.0, 0.0, 0.5], [0.0, 1.0, 0.5], [0.2, 0.1, 0.0], [0.3, 0.7, 0.1]], dtype=np.float32)
+RAW = np.array([[0, 64, 128, 255], [255, 0, 10, 20], [30, 200, 90, 60]], dtype=np.uint8)
+
+class FakeKerasModel:
+    def predict(self, data):
+        return data.reshape(len(data), -1).astype(np.float32) @ WEIGHTS
+
+class FakeInterpreter:
+    def __init__(self, dtype=np.float32, quantization=(0.0, 0)):
+        self.input = {'index': 0, 'shape': np.array(RAW.shape), 'dtype': dtype, 'quantization': quantization}
+        self.output = {'index': 1, 'quantization': (0.0, 0)}
+        self.tensor = None
+
+    def get_input_details(self):
+        return [self.input]
+
+    def get_output_details(self):
+        return [self.output]
+
+    def resize_tensor_input(self, index, shape):
+        self.input['shape'] = np.array(shape)
+
+    def allocate_tensors(self):
+        pass
+
+    def set_tensor(self, index, value):
+        assert value.dtype == self.input['dtype']
+        self.tensor = value
+
+    def invoke(self):
+        data = self.tensor.astype(np.float32)
+        scale, zero_point = self.input['quantization']
+        if np.issubdtype(self.input['dtype'], np.integer) and scale > 0:
+            data = (data - zero_point) * scale
+        self.result = data.reshape(len(data), -1) @ WEIGHTS
+
+    def get_tensor(self, index):
+        return self.result
+
+class FakeCommunication:
+    def __init__(self):
+        self.sent = []
+
+    def send_data(self, data):
+        self.sent.append(data)
+        return True
+
+@pytest.fixture
+def models(monkeypatch):
+    """
+    Replaces model loading; tests fill the returned dict with the TFLite interpreters that 'exist'.
+    """
+    interpreters = {}
+    monkeypatch.setattr(InferenceEngine, "load_model", lambda self: FakeKerasModel())
+    monkeypatch.setattr(InferenceEngine, "load_quantized_model", lambda self: interpreters.get(self.precision))
+    monkeypatch.setattr(engine_module, "CommunicationModule", FakeCommunication)
+    return interpreters
+
+def test_preprocess_dtype_follows_mode(models):
+    models['float16'] = FakeInterpreter(dtype=np.float16)
+    models['int8'] = FakeInterpreter(dtype=np.int8, quantization=(1.0 / 255.0, -128))
+
+    assert InferenceEngine(precision="float32").preprocess_data(RAW).dtype == np.float32
+    assert InferenceEngine(precision="float16").preprocess_data(RAW).dtype == np.float16
+    assert InferenceEngine(precision="int8").preprocess_data(RAW).dtype == np.int8
+
+def test_dynamic_range_model_gets_float_inputs(models):
+    models['int8'] = FakeInterpreter(dtype=np.float32, quantization=(0.0, 0))
+    engine = InferenceEngine(precision="int8")
+    preprocessed = engine.preprocess_data(RAW)
+    assert preprocessed.dtype == np.float32
+    assert preprocessed.max() == pytest.approx(1.0)
+    assert engine.perform_inference(RAW) is not None
+
+def test_quantize_input_applies_scale_and_zero_point(models):
+    engine = InferenceEngine(precision="float32")
+    quantized = engine._quantize_input(np.array([0, 128, 255]), np.dtype(np.int8), (1.0 / 255.0, -128))
+    np.testing.assert_array_equal(quantized, [-128, 0, 127])
+
+    halved = engine._quantize_input(np.array([0, 255]), np.dtype(np.uint8), (2.0 / 255.0, 0))
+    np.testing.assert_array_equal(halved, [0, 128])
+
+    raw = engine._quantize_input(np.array([0, 200]), np.dtype(np.uint8), (0.0, 0))
+    np.testing.assert_array_equal(raw, [0, 200])
+
+def test_encode_float16(models):
+    engine = InferenceEngine(result_encoding="float16")
+    encoded = engine.encode_results(np.array([[0.1, 0.7, 0.2]], dtype=np.float32))
+    assert encoded.dtype == np.float16
+
+def test_encode_top_k_orders_scores_and_caps_k(models):
+    engine = InferenceEngine(result_encoding="top_k")
+    encoded = engine.encode_results(np.array([[0.1, 0.7, 0.2], [0.5, 0.3, 0.9]], dtype=np.float32))
+    assert encoded['indices'].dtype == np.int32
+    assert encoded['scores'].dtype == np.float16
+    np.testing.assert_array_equal(encoded['indices'], [[1, 2, 0], [2, 0, 1]])
+    assert np.all(np.diff(encoded['scores'].astype(np.float32), axis=-1) <= 0)
+
+def test_int8_falls_back_to_float16_model(models):
+    models['float16'] = FakeInterpreter(dtype=np.float16)
+    engine = InferenceEngine(precision="int8")
+    assert engine.precision == "float16"
+    assert engine.quantized_model is models['float16']
+    assert engine.model is None
+
+def test_missing_reduced_precision_models_fall_back_to_float32(models):
+    engine = InferenceEngine(precision="int8")
+    assert engine.precision == "float32"
+    assert engine.quantized_model is None
+    assert isinstance(engine.model, FakeKerasModel)
+
+def test_precision_report_rows(models):
+    models['int8'] = FakeInterpreter(dtype=np.int8, quantization=(1.0 / 255.0, -128))
+    report = generate_precision_report(RAW, runs=1)
+
+    # float16 has no model, so only float32 and int8 are reported, once per encoding
+    assert [(row['mode'], row['encoding']) for row in report] == [
+        ('float32', 'full'), ('float32', 'float16'), ('float32', 'top_k'),
+        ('int8', 'full'), ('int8', 'float16'), ('int8', 'top_k'),
+    ]
+    baseline = report[0]
+    assert baseline['top1_agreement'] == 1.0 and baseline['max_abs_error'] == 0.0
+    sizes = {row['encoding']: row['result_bytes'] for row in report if row['mode'] == 'float32'}
+    assert sizes['float16'] < sizes['full']
+    assert all(row['topk_recall'] == 1.0 for row in report if row['encoding'] == 'top_k')
+
+def test_handle_inference_task_sends_serialized_results(models, monkeypatch):
+    monkeypatch.setattr(engine_module.DataCache, "retrieve_data", lambda self, key: RAW)
+    engine = InferenceEngine(result_encoding="top_k")
+    engine.handle_inference_task("inference_input")
+
+    (payload,) = engine.communication.sent
+    restored = deserialize_results(payload)
+    np.testing.assert_array_equal(restored['indices'], engine.encode_results(FakeKerasModel().predict(RAW / 255.0))['indices'])
+
+def test_serialized_results_round_trip():
+    array = np.arange(6, dtype=np.float16).reshape(2, 3)
+    np.testing.assert_array_equal(deserialize_results(serialize_results(array)), array)
@@ -0,0 +1,118 @@
+# test_scheduler.py
+# Tests for priority, deadline and admission control handling in the TaskScheduler
+
+import time
+import pytest
+from src.common.config import Config, FrozenConfig
+from src.server import scheduler as scheduler_module
+from src.server.scheduler import (TaskScheduler, TASK_ASSIGNED, TASK_QUEUED, TASK_REJECTED,
+                                  TASK_PREEMPTED, TASK_EXPIRED, TASK_NODE_REMOVED)
+
+@pytest.fixture
+def small_queue(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "Config", FrozenConfig(dict(Config.as_dict(), MAX_READY_QUEUE_SIZE=2)))
+
+def test_tasks_are_deferred_without_nodes_and_dispatched_when_a_node_joins():
+    scheduler = TaskScheduler()
+    assert scheduler.schedule_task({'id': 'a', 'load': 5}) == TASK_QUEUED
+    scheduler.update_node_status('n1', {'load': 0, 'capacity': 10})
+    assert [task['id'] for task in scheduler.node_status['n1']['tasks']] == ['a']
+    assert scheduler.queued_load == 0
+
+def test_ready_queue_orders_by_priority_then_deadline():
+    scheduler = TaskScheduler()
+    now = time.time()
+    scheduler.schedule_task({'id': 'batch', 'load': 1, 'priority': 'batch', 'deadline': now + 10})
+    scheduler.schedule_task({'id': 'late', 'load': 1, 'priority': 'high', 'deadline': now + 20})
+    scheduler.schedule_task({'id': 'early', 'load': 1, 'priority': 'high', 'deadline': now + 5})
+    scheduler.update_node_status('n1', {'load': 0, 'capacity': 2})
+    assert [task['id'] for task in scheduler.node_status['n1']['tasks']] == ['early', 'late']
+    assert [entry[3]['id'] for entry in scheduler.tasks_queue] == ['batch']
+
+def test_heartbeat_without_tasks_keeps_assigned_tasks():
+    scheduler = TaskScheduler()
+    scheduler.update_node_status('n1', {'load': 0, 'capacity': 10})
+    assert scheduler.schedule_task({'id': 'a', 'load': 10}) == TASK_ASSIGNED
+    scheduler.schedule_task({'id': 'b', 'load': 5})
+    scheduler.update_node_status('n1', {'load': 10})
+    assert [task['id'] for task in scheduler.node_status['n1']['tasks']] == ['a']
+
+def test_queued_low_priority_task_is_preempted(small_queue):
+    dropped = []
+    scheduler = TaskScheduler(on_task_dropped=lambda task, reason: dropped.append((task['id'], reason)))
+    scheduler.update_node_status('n1', {'load': 10, 'capacity': 10})
+    assert scheduler.schedule_task({'id': 'b1', 'load': 1, 'priority': 'batch'}) == TASK_QUEUED
+    assert scheduler.schedule_task({'id': 'b2', 'load': 1, 'priority': 'batch'}) == TASK_QUEUED
+    assert scheduler.schedule_task({'id': 'c', 'load': 1, 'priority': 'critical'}) == TASK_QUEUED
+    assert dropped == [('b2', TASK_PREEMPTED)]
+    assert scheduler.pop_dropped_tasks() == {'b2': TASK_PREEMPTED}
+    assert scheduler.pop_dropped_tasks() == {}
+    assert scheduler.queued_load == 2
+
+def test_task_is_rejected_when_nothing_can_be_preempted(small_queue):
+    scheduler = TaskScheduler()
+    scheduler.update_node_status('n1', {'load': 10, 'capacity': 10})
+    scheduler.schedule_task({'id': 'c1', 'load': 1, 'priority': 'critical'})
+    scheduler.schedule_task({'id': 'c2', 'load': 1, 'priority': 'critical'})
+    assert scheduler.schedule_task({'id': 'b', 'load': 1, 'priority': 'batch'}) == TASK_REJECTED
+    assert len(scheduler.tasks_queue) == 2
+
+def test_backlog_beyond_fleet_capacity_is_rejected():
+    scheduler = TaskScheduler()
+    scheduler.update_node_status('n1', {'load': 10, 'capacity': 10})
+    backlog_limit = int(10 * Config.ADMISSION_BACKLOG_FACTOR)
+    for i in range(backlog_limit):
+        assert scheduler.schedule_task({'id': f't{i}', 'load': 1}) == TASK_QUEUED
+    assert scheduler.schedule_task({'id': 'over', 'load': 1}) == TASK_REJECTED
+
+def test_task_larger_than_any_node_is_rejected():
+    scheduler = TaskScheduler()
+    scheduler.update_node_status('n1', {'load': 0, 'capacity': 10})
+    assert scheduler.schedule_task({'id': 'huge', 'load': 11}) == TASK_REJECTED
+    assert scheduler.tasks_queue == []
+
+def test_expired_queued_task_is_reported():
+    scheduler = TaskScheduler()
+    scheduler.update_node_status('n1', {'load': 10, 'capacity': 10})
+    scheduler.schedule_task({'id': 'stale', 'load': 1, 'deadline': time.time() - 1})
+    assert scheduler.dispatch_ready_tasks() == 0
+    assert scheduler.pop_dropped_tasks() == {'stale': TASK_EXPIRED}
+    assert scheduler.queued_load == 0
+
+def test_new_low_priority_task_cannot_pass_a_blocked_higher_priority_task():
+    scheduler = TaskScheduler()
+    scheduler.update_node_status('n1', {'load': 0, 'capacity': 10})
+    assert scheduler.schedule_task({'id': 'b0', 'load': 5, 'priority': 'batch'}) == TASK_ASSIGNED
+    assert scheduler.schedule_task({'id': 'crit', 'load': 8, 'priority': 'critical'}) == TASK_QUEUED
+    assert scheduler.schedule_task({'id': 'b1', 'load': 5, 'priority': 'batch'}) == TASK_QUEUED
+
+    scheduler.complete_task('n1', 'b0')
+    assert [task['id'] for task in scheduler.node_status['n1']['tasks']] == ['crit']
+    assert [entry[3]['id'] for entry in scheduler.tasks_queue] == ['b1']
+
+def test_removed_node_tasks_are_requeued():
+    scheduler = TaskScheduler()
+    scheduler.update_node_status('n1', {'load': 0, 'capacity': 10})
+    scheduler.schedule_task({'id': 'a', 'load': 4})
+    scheduler.schedule_task({'id': 'b', 'load': 4})
+    scheduler.update_node_status('n2', {'load': 10, 'capacity': 10})
+
+    scheduler.remove_node('n1')
+    assert sorted(entry[3]['id'] for entry in scheduler.tasks_queue) == ['a', 'b']
+    assert scheduler.queued_load == 8
+    assert scheduler.pop_dropped_tasks() == {}
+
+    scheduler.update_node_status('n2', {'load': 0})
+    assert sorted(task['id'] for task in scheduler.node_status['n2']['tasks']) == ['a', 'b']
+
+def test_removed_node_tasks_are_reported_when_they_cannot_be_requeued(small_queue):
+    dropped = []
+    scheduler = TaskScheduler(on_task_dropped=lambda task, reason: dropped.append((task['id'], reason)))
+    scheduler.update_node_status('n1', {'load': 0, 'capacity': 10})
+    for task_id in ('a', 'b', 'c'):
+        scheduler.schedule_task({'id': task_id, 'load': 3})
+
+    scheduler.remove_node('n1')
+    assert len(scheduler.tasks_queue) == 2
+    assert scheduler.pop_dropped_tasks() == {'c': TASK_NODE_REMOVED}
+    assert dropped == [('c', TASK_NODE_REMOVED)]
@@ -0,0 +1,39 @@
+# test_startup.py
+# Startup benchmark: the server and vehicle entry points must import quickly and without the heavy dependencies
+
+import os
+import subprocess
+import sys
+import time
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_BUDGET_SECONDS = 1.0
+
+def profile_import(module):
+    """
+    Imports a module in a fresh interpreter under `python -X importtime`.
+    :return: Wall time in seconds and a dict of module name -> cumulative import time in microseconds.
+    """
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return elapsed, modules
+
+@pytest.mark.parametrize("entry_point", ["src.server.server_main", "src.vehicle.vehicle_main"])
+def test_entry_point_imports_within_budget(entry_point):
+    elapsed, modules = profile_import(entry_point)
+    slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:10]
+    print(f"\n{entry_point} imported in {elapsed * 1000.0:.1f} ms; slowest modules:")
+    for name, cumulative in slowest:
+        print(f"  {cumulative / 1000.0:8.1f} ms  {name}")
+
+    assert elapsed < STARTUP_BUDGET_SECONDS
+    assert not any(name.split(".")[0] in ("tensorflow", "cryptography") for name in modules)